@@ -1,23 +1,38 @@
+import os
+
 import scraper
 import pdf_extractor
 import database
-import chatbot
+import metrics
+import profiling
 
 def main():
+    # AGRI_PROFILE=1 runs the whole pipeline under cProfile and tracemalloc
+    try:
+        with profiling.maybe_profile("amain"):
+            run_pipeline()
+    finally:
+        # Dump stage timings for scraping by a Prometheus textfile collector, even after a failed run
+        metrics_file = os.environ.get("AGRI_METRICS_FILE")
+        if metrics_file:
+            metrics.write_prometheus(metrics_file)
+
+
+def run_pipeline():
     print("🚀 Running Smart Agriculture Chatbot System")
 
     print("\n📥 Downloading latest farming PDFs...")
-    scraper.download_pdfs()
+    with metrics.timer("ingest_download"):
+        scraper.download_pdfs()
 
     print("\n📄 Extracting text from PDFs...")
-    data = pdf_extractor.extract_text_from_pdfs()
+    with metrics.timer("ingest_extract"):
+        data = pdf_extractor.extract_text_from_pdfs()
 
     print("\n🗄️ Storing extracted data in database...")
-    database.init_db()
-    database.store_in_db(data)
-
-    print("\n🤖 Starting the chatbot...")
-    chatbot.chatbot()
+    with metrics.timer("ingest_store"):
+        database.init_db()
+        database.store_in_db(data)
 
     # Test with different farming queries
     test_queries = [
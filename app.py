@@ -1,19 +1,12 @@
 import streamlit as st
-import sqlite3
-import requests
-import numpy as np
-import pickle
-from irrigation import get_irrigation_recommendation
-from PIL import Image
 import streamlit.components.v1 as components
-import joblib
 
-# Load trained crop model
-with open("xgb_crop_model.pkl", "rb") as model_file:
-    model = pickle.load(model_file)
+import database
+import metrics
+import profiling
 
-with open("label_encoder.pkl", "rb") as le_file:
-    le = pickle.load(le_file)
+# Heavy modules (numpy, xgboost, skfuzzy, joblib) are imported inside the
+# tab or button that needs them, so opening the Home tab stays cheap.
 
 # Descriptive mappings
 SOIL_MOISTURE_MAP = {
@@ -50,53 +43,66 @@ def to_mid(value):
     except:
         return None
 
+
 # FAQ chatbot
+@metrics.timed("faq_search")
 def get_farming_info(query):
-    conn = sqlite3.connect("farming_data.db")
-    cursor = conn.cursor()
-    
-    query = query.lower()
-    cursor.execute("SELECT question, response FROM farming_info")
-    data = cursor.fetchall()
-    
-    best_match = None
-    highest_score = 0
+    # FAQ index first, then the answer cache, then the AI backend
+    return database.get_farming_info(query)
 
-    for question, response in data:
-        score = sum(1 for word in query.split() if word in question.lower() or word in response.lower())
-        if score > highest_score:
-            highest_score = score
-            best_match = response
 
-    conn.close()
-    return best_match if best_match else "⚠️ No relevant farming info found."
+@st.cache_data(ttl=600)
+def load_faqs(limit=5):
+    return database.load_faqs(limit)
 
-# Crop prediction logic
-def predict_crop(input_features):
-    input_array = np.array([input_features]).reshape(1, -1)
-    predicted_label = model.predict(input_array)[0]
-    predicted_crop = le.inverse_transform([predicted_label])[0]
-    return predicted_crop
 
-# UI
-st.set_page_config(page_title="AgriAssistant", layout="wide")
-st.title("🌾 AgriAssistant Dashboard")
+# Static markup
+HOME_HERO_HTML = """
+    <div style="text-align: center; padding: 20px;">
+        <img src="https://i.pinimg.com/736x/9e/04/c9/9e04c9ddf8b801ff8ec074a8c3865ef8.jpg" 
+            alt="Farmers at work in the field" 
+            style="width: 500px; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
+        <p style="font-style: italic; color: gray; margin-top: 8px;">Farmers at work in the field</p>
+    </div>
+"""
+
+INTRO_VIDEO_HTML = """
+    <iframe width="560" height="315" src="https://www.youtube.com/embed/NMhoUELo3Cc" frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen></iframe>
+"""
+
+CHATBOT_HTML = """
+    <div id="chatbot-container" style="height: 600px; width: 100%;"></div>
+
+    <script>
+(function(){if(!window.chatbase||window.chatbase("getState")!=="initialized"){window.chatbase=(...arguments)=>{if(!window.chatbase.q){window.chatbase.q=[]}window.chatbase.q.push(arguments)};window.chatbase=new Proxy(window.chatbase,{get(target,prop){if(prop==="q"){return target.q}return(...args)=>target(prop,...args)}})}const onLoad=function(){const script=document.createElement("script");script.src="https://www.chatbase.co/embed.min.js";script.id="2cWA9yXY2No0Nkcu5iB6P";script.domain="www.chatbase.co";document.body.appendChild(script)};if(document.readyState==="complete"){onLoad()}else{window.addEventListener("load",onLoad)}})();
+</script>
 
-tabs = st.tabs(["🏡 Home", "🌱 Crop Recommendation", "💧 Irrigation", "Chat with AgriBot 🤖", "🤖 FAQ Chatbot", "🌾 Yield Prediction"])
+    <script src="https://www.chatbase.co/embed.min.js" id="chatbase-script" defer></script>
+"""
 
+CROP_CATEGORIES = {
+    "Cereal Crops": ["Maize", "Wheat", "Barley"],
+    "Vegetables": ["Tomato", "Potato", "Cabbage"],
+    "Fruits": ["Strawberry", "Mango", "Banana"],
+    "Legumes": ["Beans", "Peas"],
+    "Root Crops": ["Carrot", "Cassava", "Beetroot"]
+}
+
+
+def profile_requested():
+    return st.query_params.get("profile") == "1"
+
+
+# Each tab is a fragment, so a widget change reruns only its own tab.
+# @profiling.profiled sits under @st.fragment so ?profile=1 also captures those fragment-only reruns.
 # Home Tab
-with tabs[0]:
+@st.fragment
+@profiling.profiled("home_tab", force=profile_requested)
+def home_tab():
     st.markdown("# Welcome to AgriAssistant! 🌱")
     st.markdown("### Empowering Farmers with AI-driven Insights")
 
-    st.markdown("""
-        <div style="text-align: center; padding: 20px;">
-            <img src="https://i.pinimg.com/736x/9e/04/c9/9e04c9ddf8b801ff8ec074a8c3865ef8.jpg" 
-                alt="Farmers at work in the field" 
-                style="width: 500px; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
-            <p style="font-style: italic; color: gray; margin-top: 8px;">Farmers at work in the field</p>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HOME_HERO_HTML, unsafe_allow_html=True)
 
     st.write("""
         **AgriAssistant** uses artificial intelligence to provide personalized insights for farmers, helping them make informed decisions for efficient farming. 
@@ -113,15 +119,13 @@ with tabs[0]:
     st.button("Start Exploring")
 
     st.markdown("### Watch our Introduction Video 🎥")
-    components.html(
-        """
-        <iframe width="560" height="315" src="https://www.youtube.com/embed/NMhoUELo3Cc" frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen></iframe>
-        """,
-        height=350
-    )
+    components.html(INTRO_VIDEO_HTML, height=350)
+
 
 # Crop Recommendation Tab
-with tabs[1]:
+@st.fragment
+@profiling.profiled("crop_tab", force=profile_requested)
+def crop_tab():
     st.subheader("🌱 Enter Soil & Climate Data")
 
     st.markdown("## How the Crop Recommendation System Works 🧠")
@@ -142,6 +146,8 @@ with tabs[1]:
         rainfall = st.number_input("Rainfall (mm)", 0.0, 500.0)
 
     if st.button("🚀 Predict Crop"):
+        from inference import predict_crop
+
         features = [N, P, K, temp, hum, pH, rainfall]
         try:
             crop = predict_crop(features)
@@ -149,20 +155,15 @@ with tabs[1]:
         except Exception as e:
             st.error(f"Error: {e}")
 
+
 # Irrigation Tab
-with tabs[2]:
+@st.fragment
+@profiling.profiled("irrigation_tab", force=profile_requested)
+def irrigation_tab():
     st.subheader("💧 Get Irrigation Advice")
 
-    crop_categories = {
-        "Cereal Crops": ["Maize", "Wheat", "Barley"],
-        "Vegetables": ["Tomato", "Potato", "Cabbage"],
-        "Fruits": ["Strawberry", "Mango", "Banana"],
-        "Legumes": ["Beans", "Peas"],
-        "Root Crops": ["Carrot", "Cassava", "Beetroot"]
-    }
-
-    category = st.selectbox("🌾 Select Crop Category", list(crop_categories.keys()))
-    crop = st.selectbox("🌱 Select Specific Crop", crop_categories[category])
+    category = st.selectbox("🌾 Select Crop Category", list(CROP_CATEGORIES.keys()))
+    crop = st.selectbox("🌱 Select Specific Crop", CROP_CATEGORIES[category])
 
     soil = st.selectbox("Soil Moisture", list(SOIL_MOISTURE_MAP.keys()) + [10, 30, 50, 70])
     temp = st.selectbox("Temperature", list(TEMPERATURE_MAP.keys()) + [10, 25, 40])
@@ -176,27 +177,21 @@ with tabs[2]:
         if None in (soil_val, temp_val, hum_val):
             st.warning("⚠️ Please enter valid values.")
         else:
+            from irrigation import get_irrigation_recommendation
+
             recommendation = get_irrigation_recommendation(soil_val, temp_val, hum_val, crop)
             st.success(recommendation)
 
+
 # Chat with AgriBot
-with tabs[3]:
+@st.fragment
+@profiling.profiled("agribot_tab", force=profile_requested)
+def agribot_tab():
     st.markdown("## 💬 Chat with AgriBot")
     col1, col2 = st.columns([1.2, 1])
     with col1:
         st.markdown("### 🤖 Your Farming Assistant")
-        components.html(
-            """
-            <div id="chatbot-container" style="height: 600px; width: 100%;"></div>
-
-            <script>
-(function(){if(!window.chatbase||window.chatbase("getState")!=="initialized"){window.chatbase=(...arguments)=>{if(!window.chatbase.q){window.chatbase.q=[]}window.chatbase.q.push(arguments)};window.chatbase=new Proxy(window.chatbase,{get(target,prop){if(prop==="q"){return target.q}return(...args)=>target(prop,...args)}})}const onLoad=function(){const script=document.createElement("script");script.src="https://www.chatbase.co/embed.min.js";script.id="2cWA9yXY2No0Nkcu5iB6P";script.domain="www.chatbase.co";document.body.appendChild(script)};if(document.readyState==="complete"){onLoad()}else{window.addEventListener("load",onLoad)}})();
-</script>
-
-            <script src="https://www.chatbase.co/embed.min.js" id="chatbase-script" defer></script>
-            """,
-            height=540
-        )
+        components.html(CHATBOT_HTML, height=540)
     with col2:
         st.markdown("### 📋 How to Use AgriBot")
         st.write("""
@@ -209,7 +204,9 @@ with tabs[3]:
 
 
 # FAQ Tab
-with tabs[4]:
+@st.fragment
+@profiling.profiled("faq_tab", force=profile_requested)
+def faq_tab():
     st.subheader("🤖 Ask the FAQ Bot")
     
     st.markdown("### 💡 Example Questions You Can Ask:")
@@ -232,34 +229,21 @@ with tabs[4]:
     # Show common Q&A
     st.markdown("### 📌 Frequently Asked Questions (FAQs)")
 
-    conn = sqlite3.connect("farming_data.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT question, response FROM farming_info LIMIT 5")
-    faqs = cursor.fetchall()
-    conn.close()
-
-    for i, (q, a) in enumerate(faqs, start=1):
+    for i, (q, a) in enumerate(load_faqs(), start=1):
         st.markdown(f"**Q{i}: {q}**")
         st.markdown(f"🟢 *A{i}: {a}*")
 
 
 # start tab 5 which is about climate impact on agriculture, a research based ML project
-# Load model and encoder once
-@st.cache_resource
-def load_model():
-    model = joblib.load("random_forest_model.joblib")
-    le = joblib.load("label_encoder.joblib")
-    return model, le
-
-model, le = load_model()
-
 # =======================
 # Tab 5: Prediction Page
 # =======================
 # Last tab - Yield Prediction
-with tabs[5]:
-						st.title("🌾 Climate Impact Prediction on Crop Yield")
-						st.markdown("""
+@st.fragment
+@profiling.profiled("yield_tab", force=profile_requested)
+def yield_tab():
+    st.title("🌾 Climate Impact Prediction on Crop Yield")
+    st.markdown("""
 ---
 ### 🌍 Why This Matters
 
@@ -274,57 +258,53 @@ By integrating climate-aware crop yield prediction, the platform evolves into a
 > 🎯 **This bridges the gap between advanced modeling and local impact.**
 """)
 
-						st.markdown("Use the form below to predict crop yield based on climate and agricultural inputs.")
-
-						with st.form("yield_prediction_form"):
-							st.markdown("### 🌍 Climate & Region")
-							year = st.number_input("Year", min_value=2000, max_value=2100, value=2024)
-							region = st.selectbox("Region", le.classes_)
-
-							st.markdown("### 🌡️ Climate Features")
-							temp = st.slider("Average Temperature (°C)", 0.0, 50.0, 25.0)
-							rain = st.slider("Total Precipitation (mm)", 0.0, 2000.0, 500.0)
-							events = st.number_input("Extreme Weather Events (annual)", min_value=0, value=2)
-							co2 = st.slider("CO₂ Emissions (metric tons)", 0.0, 100.0, 30.0)
-
-							st.markdown("### 🌾 Farming Inputs")
-							irrigation = st.slider("Irrigation Access (%)", 0, 100, 60)
-							fertilizer = st.slider("Fertilizer Use (kg/ha)", 0.0, 300.0, 100.0)
-							pesticide = st.slider("Pesticide Use (kg/ha)", 0.0, 50.0, 10.0)  # Not yet used in model
-							soil_health = st.slider("Soil Health Index (0–100)", 0.0, 100.0, 70.0)
-
-							submitted = st.form_submit_button("📊 Predict Crop Yield")
-
-							if submitted:
-								region_encoded = le.transform([region])[0]
-								temp_x_rain = temp * rain
-								weather_impact = events * temp
-								temp_sq = temp ** 2
-								rain_sq = rain ** 2
-
-								# Build feature array in the order model expects
-								X_input = np.array([[
-									temp,
-									rain,
-									events,
-									co2,
-									irrigation,
-									fertilizer,
-									soil_health,
-									region_encoded,
-									temp_x_rain,
-									weather_impact,
-									temp_sq,
-									rain_sq
-								]])
-
-								# Predict
-								prediction = model.predict(X_input)[0]
-
-								st.success(f"✅ **Predicted Crop Yield: {prediction:.2f} tons/hectare**")
-
-								# 👇 Research-based and human-readable interpretation
-								st.markdown(f"""
+    from inference import load_yield_model, predict_yields
+
+    # Load model and encoder once
+    try:
+        _, le = load_yield_model()
+    except FileNotFoundError as e:
+        st.error(f"⚠️ Yield model not available: {e.filename}")
+        return
+
+    st.markdown("Use the form below to predict crop yield based on climate and agricultural inputs.")
+
+    with st.form("yield_prediction_form"):
+        st.markdown("### 🌍 Climate & Region")
+        year = st.number_input("Year", min_value=2000, max_value=2100, value=2024)
+        region = st.selectbox("Region", le.classes_)
+
+        st.markdown("### 🌡️ Climate Features")
+        temp = st.slider("Average Temperature (°C)", 0.0, 50.0, 25.0)
+        rain = st.slider("Total Precipitation (mm)", 0.0, 2000.0, 500.0)
+        events = st.number_input("Extreme Weather Events (annual)", min_value=0, value=2)
+        co2 = st.slider("CO₂ Emissions (metric tons)", 0.0, 100.0, 30.0)
+
+        st.markdown("### 🌾 Farming Inputs")
+        irrigation = st.slider("Irrigation Access (%)", 0, 100, 60)
+        fertilizer = st.slider("Fertilizer Use (kg/ha)", 0.0, 300.0, 100.0)
+        pesticide = st.slider("Pesticide Use (kg/ha)", 0.0, 50.0, 10.0)  # Not yet used in model
+        soil_health = st.slider("Soil Health Index (0–100)", 0.0, 100.0, 70.0)
+
+        submitted = st.form_submit_button("📊 Predict Crop Yield")
+
+        if submitted:
+            # Predict through the same path as the API, so the yield metrics count dashboard predictions too
+            prediction = predict_yields([{
+                "region": region,
+                "temperature": temp,
+                "precipitation": rain,
+                "extreme_events": events,
+                "co2": co2,
+                "irrigation": irrigation,
+                "fertilizer": fertilizer,
+                "soil_health": soil_health
+            }])[0]
+
+            st.success(f"✅ **Predicted Crop Yield: {prediction:.2f} tons/hectare**")
+
+            # 👇 Research-based and human-readable interpretation
+            st.markdown(f"""
 ### 📈 What does this mean?
 
 Based on the climate and farming inputs you provided, the expected crop yield is approximately  
@@ -340,21 +320,64 @@ Based on the climate and farming inputs you provided, the expected crop yield is
 This prediction is generated using a machine learning model trained on simulated data that reflects real-world agricultural patterns, helping us explore **how climate change could affect food production**.
 """)
 
-								# 👇 Optional: detailed input summary
-								with st.expander("📋 View Input Summary"):
-									st.markdown("""
+            # 👇 Optional: detailed input summary
+            with st.expander("📋 View Input Summary"):
+                st.markdown("""
 Here are the climate and farming inputs used to generate the prediction:
 """)
-									st.json({
-										"Region": region,
-										"Year": year,
-										"Temperature (°C)": temp,
-										"Precipitation (mm)": rain,
-										"CO₂ Emissions (MT)": co2,
-										"Extreme Events": events,
-										"Irrigation (%)": irrigation,
-										"Fertilizer (kg/ha)": fertilizer,
-										"Pesticide (kg/ha)": pesticide,
-										"Soil Health Index": soil_health
-									})
+                st.json({
+                    "Region": region,
+                    "Year": year,
+                    "Temperature (°C)": temp,
+                    "Precipitation (mm)": rain,
+                    "CO₂ Emissions (MT)": co2,
+                    "Extreme Events": events,
+                    "Irrigation (%)": irrigation,
+                    "Fertilizer (kg/ha)": fertilizer,
+                    "Pesticide (kg/ha)": pesticide,
+                    "Soil Health Index": soil_health
+                })
+
+
+# Admin Tab (hidden, open with ?admin=1)
+def metrics_tab():
+    st.subheader("📈 Latency & Throughput")
+    st.caption("In-process metrics since this server started.")
+
+    rows = metrics.snapshot()
+    if rows:
+        st.dataframe(rows)
+    else:
+        st.info("No operations recorded yet.")
+
+    prometheus_text = metrics.render_prometheus()
+    st.download_button("⬇️ Download Prometheus metrics", prometheus_text, file_name="metrics.prom")
+    with st.expander("Prometheus text format"):
+        st.code(prometheus_text)
+
+
+# UI
+st.set_page_config(page_title="AgriAssistant", layout="wide")
+st.title("🌾 AgriAssistant Dashboard")
+
+# Only the selected tab runs, so hidden tabs cost nothing on a rerun
+TABS = {
+    "🏡 Home": home_tab,
+    "🌱 Crop Recommendation": crop_tab,
+    "💧 Irrigation": irrigation_tab,
+    "Chat with AgriBot 🤖": agribot_tab,
+    "🤖 FAQ Chatbot": faq_tab,
+    "🌾 Yield Prediction": yield_tab,
+}
+
+if st.query_params.get("admin") == "1":
+    TABS["📈 Metrics"] = metrics_tab
+
+tabs = st.tabs(list(TABS), key="active_tab", on_change="rerun")
 
+# ?profile=1 captures every rerun, full or fragment-only, until the parameter is removed
+with profiling.maybe_profile("rerun", force=profile_requested()):
+    for tab, render_tab in zip(tabs, TABS.values()):
+        if tab.open:
+            with tab:
+                render_tab()
@@ -0,0 +1,217 @@
+# Description: Benchmark suite for predictions, irrigation, FAQ search, sharded search, PDF extraction and DB ingest.
+# Usage: python benchmark.py [--rows 100000] [--only predict,faq] [--compare bench_results/old.json]
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import database
+import synthetic_data
+
+RESULTS_DIR = "bench_results"
+REGRESSION_THRESHOLD = 0.15
+
+
+def bench(name, func, repeat=20, number=1, items=1):
+    """Time `func` `repeat` times (each `number` calls) and summarise per-call latency."""
+    func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    samples.sort()
+    median = statistics.median(samples)
+    result = {
+        "name": name,
+        "repeat": repeat,
+        "number": number,
+        "min_ms": round(samples[0] * 1000, 4),
+        "median_ms": round(median * 1000, 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))] * 1000, 4),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "items_per_sec": round(items / median, 1) if median else None,
+    }
+    print(f"  {name:<36} median {result['median_ms']:>10.3f} ms   {result['items_per_sec']:>12} items/s")
+    return result
+
+
+# Suites
+def bench_predict(args):
+    from inference import load_crop_model, predict_crop, predict_crops
+
+    load_crop_model()
+    samples = synthetic_data.soil_samples(1024)
+    results = [bench("predict_crop single", lambda: predict_crop(samples[0]), repeat=50, number=5)]
+    for size in (64, 1024):
+        batch = samples[:size]
+        results.append(bench(f"predict_crops batch={size}", lambda: predict_crops(batch), repeat=20, items=size))
+    return results
+
+
+def bench_irrigation(args):
+    from irrigation import get_irrigation_recommendation
+
+    readings = iter(synthetic_data.sensor_readings(10_000))
+
+    def one():
+        soil, temp, hum, crop = next(readings)
+        get_irrigation_recommendation(soil, temp, hum, crop)
+
+    return [bench("get_irrigation_recommendation", one, repeat=args.repeat)]
+
+
+def bench_faq(args):
+    path = os.path.join(args.workdir, f"farming_{args.rows}.db")
+    print(f"  (building farming_info with {args.rows} rows)")
+    synthetic_data.build_farming_db(path, args.rows)
+
+    previous = database.DB_PATH
+    database.DB_PATH = path
+    try:
+        return [
+            bench(f"get_farming_info rows={args.rows}", lambda: database.get_farming_info("how to grow maize"), repeat=args.repeat),
+            bench(f"search_farming_info rows={args.rows}", lambda: database.search_farming_info("cassava wilt"), repeat=args.repeat),
+        ]
+    finally:
+        database.DB_PATH = previous
+
+
+def bench_shards(args):
+    from concurrent.futures import ThreadPoolExecutor
+
+    queries = ["how to grow maize", "control pests in cassava", "harvest coffee in Central", "market beans"] * 16
+    results = []
+    previous = database.DB_PATH
+    with ThreadPoolExecutor(max_workers=8) as clients:
+        for shards in [int(n) for n in args.shards.split(",")]:
+            database.DB_PATH = os.path.join(args.workdir, f"sharded_{shards}.db")
+            print(f"  (building {args.rows} rows in {shards} shard(s))")
+            synthetic_data.build_sharded_store(database.DB_PATH, args.rows, shards)
+            try:
+                results += [
+                    bench(f"get_farming_info shards={shards}", lambda: database.get_farming_info("how to grow maize"),
+                          repeat=args.repeat),
+                    bench(f"search_farming_info shards={shards}", lambda: database.search_farming_info("cassava wilt"),
+                          repeat=args.repeat),
+                    # Throughput with 8 concurrent callers, as under several sessions or service threads
+                    bench(f"get_farming_info x8 clients shards={shards}",
+                          lambda: list(clients.map(database.get_farming_info, queries)),
+                          repeat=max(3, args.repeat // 4), items=len(queries)),
+                ]
+            finally:
+                database.DB_PATH = previous
+    return results
+
+
+def bench_pdf(args):
+    import pdf_extractor
+
+    folder = synthetic_data.build_pdf_folder(os.path.join(args.workdir, "pdfs"), args.pdfs)
+    return [bench(f"extract_text_from_pdfs docs={args.pdfs}", lambda: pdf_extractor.extract_text_from_pdfs(folder),
+                  repeat=5, items=args.pdfs)]
+
+
+def bench_ingest(args):
+    docs = synthetic_data.brochure_texts(args.docs)
+    path = os.path.join(args.workdir, "ingest.db")
+
+    def ingest():
+        if os.path.exists(path):
+            os.remove(path)
+        database.init_db(path)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            database.store_in_db(docs)  # prints one line per row
+
+    previous = database.DB_PATH
+    database.DB_PATH = path
+    try:
+        return [bench(f"store_in_db docs={args.docs}", ingest, repeat=5, items=args.docs)]
+    finally:
+        database.DB_PATH = previous
+
+
+SUITES = {
+    "predict": bench_predict,
+    "irrigation": bench_irrigation,
+    "faq": bench_faq,
+    "shards": bench_shards,
+    "pdf": bench_pdf,
+    "ingest": bench_ingest,
+}
+
+
+# Comparing runs
+def compare(current, baseline_path, threshold):
+    """Print per-benchmark change against a saved run and return the regressions."""
+    with open(baseline_path) as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\n📊 Compared with {baseline_path}:")
+    for result in current:
+        old = baseline.get(result["name"])
+        if not old or not old["median_ms"]:
+            continue
+        change = result["median_ms"] / old["median_ms"] - 1
+        flag = "❌" if change > threshold else "✅"
+        print(f"  {flag} {result['name']:<36} {old['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms ({change:+.1%})")
+        if change > threshold:
+            regressions.append(result["name"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgriAssistant benchmark suite")
+    parser.add_argument("--only", help=f"Comma-separated suites: {', '.join(SUITES)}")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic farming_info rows for FAQ search")
+    parser.add_argument("--shards", default="1,2,4,8", help="Shard counts for the shards suite")
+    parser.add_argument("--pdfs", type=int, default=10, help="Synthetic PDFs to extract")
+    parser.add_argument("--docs", type=int, default=1_000, help="Synthetic documents to ingest")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Where to save results (default: bench_results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Median slowdown that counts as a regression (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(SUITES)
+    unknown = [name for name in names if name not in SUITES]
+    if unknown:
+        parser.error(f"Unknown suite(s): {', '.join(unknown)}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        args.workdir = workdir
+        for name in names:
+            print(f"\n⏱️ {name}")
+            results.extend(SUITES[name](args))
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "params": {"rows": args.rows, "shards": args.shards, "pdfs": args.pdfs, "docs": args.docs, "repeat": args.repeat},
+            "results": results,
+        }, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n⚠️ Regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
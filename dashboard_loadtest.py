@@ -0,0 +1,267 @@
+# Description: Drive many concurrent simulated dashboard sessions and report where they contend.
+# Usage: python dashboard_loadtest.py --sessions 1,10,50,100,200 --reruns 10 [--writers 2] [--no-cache] [--rows 10000 --shards 4]
+#
+# Streamlit's AppTest swaps a process-global Runtime on every run, so it can't run
+# sessions concurrently. This harness is a local stand-in for the Streamlit server:
+# each session is a thread doing the backend work of one tab rerun, and all sessions
+# share module-level caches and SQLite the way script threads in one server do.
+import argparse
+import contextlib
+import json
+import os
+import pickle
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import database
+import metrics
+import synthetic_data
+
+FAQ_QUESTIONS = ["how to grow maize", "potato pests", "best soil for carrots", "cassava wilt", "when to plant beans"]
+DB_OPERATIONS = ["faq_index_lookup", "faq_list_query", "db_store"]
+
+
+class SharedCache:
+    """Process-wide memo standing in for st.cache_data and st.cache_resource."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, compute, copy=True):
+        """copy=True models st.cache_data, which stores a pickle and unpickles a fresh copy on every hit;
+        copy=False models st.cache_resource, which hands every session the same object."""
+        if not self.enabled:
+            return compute()
+        with self._lock:
+            if key not in self._values:
+                value = compute()
+                self._values[key] = pickle.dumps(value) if copy else value
+            stored = self._values[key]
+        return pickle.loads(stored) if copy else stored
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# One function per dashboard flow, doing the backend work of a rerun
+def crop_rerun(session, cache, rng):
+    from inference import predict_crop
+
+    session["crop"] = predict_crop(synthetic_data.soil_samples(1, seed=rng.random())[0])
+
+
+def irrigation_rerun(session, cache, rng):
+    from irrigation import get_irrigation_recommendation
+
+    soil, temp, hum, crop = synthetic_data.sensor_readings(1, seed=rng.random())[0]
+    session["irrigation"] = get_irrigation_recommendation(soil, temp, hum, crop)
+
+
+def faq_rerun(session, cache, rng):
+    session["faq_answer"] = database.get_farming_info(rng.choice(FAQ_QUESTIONS))
+    session["faqs"] = cache.get("faqs", database.load_faqs)
+
+
+def yield_rerun(session, cache, rng):
+    from inference import load_yield_model, predict_yields
+
+    _, le = load_yield_model()
+    session["yield"] = predict_yields([{
+        "region": rng.choice(list(le.classes_)),
+        "temperature": rng.uniform(0, 50),
+        "precipitation": rng.uniform(0, 2000),
+        "extreme_events": rng.randint(0, 10),
+        "co2": rng.uniform(0, 100),
+        "irrigation": rng.randint(0, 100),
+        "fertilizer": rng.uniform(0, 300),
+        "soil_health": rng.uniform(0, 100),
+    }])[0]
+
+
+FLOWS = {
+    "crop": crop_rerun,
+    "irrigation": irrigation_rerun,
+    "faq": faq_rerun,
+    "yield": yield_rerun,
+}
+
+
+def available_flows():
+    """Warm the models like a running server would, and drop flows that can't run here."""
+    from inference import load_crop_model, load_yield_model
+
+    load_crop_model()
+    flows = dict(FLOWS)
+    try:
+        load_yield_model()
+    except FileNotFoundError as e:
+        print(f"⚠️ Skipping the yield flow: {e.filename} not found")
+        del flows["yield"]
+    return flows
+
+
+def run_session(session_id, flows, reruns, cache, barrier, samples, errors, lock):
+    rng = random.Random(session_id)
+    session = {}  # stands in for st.session_state
+    names = list(flows)
+    barrier.wait()
+
+    for _ in range(reruns):
+        flow = rng.choice(names)
+        start = time.perf_counter()
+        try:
+            flows[flow](session, cache, rng)
+        except sqlite3.OperationalError as e:
+            with lock:
+                errors["db_locked" if "locked" in str(e) else "db_error"] += 1
+            continue
+        elapsed = time.perf_counter() - start
+        with lock:
+            samples.setdefault(flow, []).append(elapsed)
+
+    return session
+
+
+def run_writer(stop, seed):
+    """Keep ingesting brochures into the same database to create write contention."""
+    batch = 0
+    while not stop.is_set():
+        docs = synthetic_data.brochure_texts(50, paragraphs=5, seed=f"{seed}-{batch}")
+        try:
+            database.store_in_db({f"{name}-w{seed}-{batch}": text for name, text in docs.items()})
+        except sqlite3.OperationalError:
+            pass
+        batch += 1
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))] if values else 0.0
+
+
+def run_level(sessions, reruns, flows, cache_enabled, writers):
+    metrics.reset()
+    cache = SharedCache(cache_enabled)
+    samples, errors, lock = {}, {"db_locked": 0, "db_error": 0}, threading.Lock()
+    barrier = threading.Barrier(sessions + 1)
+    states = []
+
+    def target(i):
+        states.append(run_session(i, flows, reruns, cache, barrier, samples, errors, lock))
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(sessions)]
+    stop = threading.Event()
+    writer_threads = [threading.Thread(target=run_writer, args=(stop, i)) for i in range(writers)]
+
+    rss_before = rss_mb()
+    # store_in_db prints a line per row; keep writer output out of the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull if writers else sys.stdout):
+        for thread in threads + writer_threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for thread in writer_threads:
+            thread.join()
+    rss_after = rss_mb()
+
+    all_samples = [s for values in samples.values() for s in values]
+    db_ops = {row["operation"]: row for row in metrics.snapshot() if row["operation"] in DB_OPERATIONS}
+    return {
+        "sessions": sessions,
+        "reruns": len(all_samples),
+        "reruns_per_sec": round(len(all_samples) / elapsed, 1),
+        "p50_ms": round(percentile(all_samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(all_samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(all_samples, 99) * 1000, 2),
+        "flows": {
+            flow: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "mean_ms": round(statistics.fmean(values) * 1000, 2),
+            }
+            for flow, values in sorted(samples.items())
+        },
+        "rss_growth_mb": round(rss_after - rss_before, 2),
+        "rss_kb_per_session": round((rss_after - rss_before) * 1024 / sessions, 1),
+        "db": {op: {"count": row["count"], "p99_ms": row["p99_ms"], "errors": row["errors"]} for op, row in db_ops.items()},
+        "db_locked": errors["db_locked"],
+        "db_errors": errors["db_error"],
+    }
+
+
+def print_level(result):
+    print(f"\n👥 {result['sessions']} sessions: {result['reruns']} reruns, {result['reruns_per_sec']} reruns/s, "
+          f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms")
+    for flow, stats in result["flows"].items():
+        print(f"   {flow:<11} n={stats['count']:<5} p50 {stats['p50_ms']:>9} ms   p99 {stats['p99_ms']:>9} ms")
+    print(f"   RSS +{result['rss_growth_mb']} MB ({result['rss_kb_per_session']} KB/session)")
+    db = ", ".join(f"{op} n={row['count']} p99≤{row['p99_ms']} ms" for op, row in result["db"].items()) or "no DB calls"
+    print(f"   SQLite: {db}; locked={result['db_locked']} other errors={result['db_errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent multi-session load test for the dashboard")
+    parser.add_argument("--sessions", default="1,10,50,100,200", help="Comma-separated concurrency levels")
+    parser.add_argument("--reruns", type=int, default=10, help="Reruns per session")
+    parser.add_argument("--flows", help=f"Comma-separated subset of: {', '.join(FLOWS)}")
+    parser.add_argument("--rows", type=int, default=0, help="Use a synthetic farming_info with this many rows")
+    parser.add_argument("--shards", type=int, default=0, help="Spread the synthetic rows over this many shards")
+    parser.add_argument("--writers", type=int, default=0, help="Concurrent ingest threads writing to the DB")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the shared FAQ cache (pre-fragment behaviour)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    flows = available_flows()
+    if args.flows:
+        flows = {name: flows[name] for name in args.flows.split(",") if name in flows}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Work on a copy so writers never touch the real database
+        db_path = os.path.join(workdir, "farming_data.db")
+        if args.rows and args.shards:
+            synthetic_data.build_sharded_store(db_path, args.rows, args.shards)
+        elif args.rows:
+            synthetic_data.build_farming_db(db_path, args.rows)
+        else:
+            shutil.copy(database.DB_PATH, db_path)
+            if os.path.isdir(database.shard_dir()):
+                shutil.copytree(database.shard_dir(), database.shard_dir(db_path))
+
+        previous = database.DB_PATH
+        database.DB_PATH = db_path
+        try:
+            results = []
+            for sessions in [int(n) for n in args.sessions.split(",")]:
+                result = run_level(sessions, args.reruns, flows, not args.no_cache, args.writers)
+                print_level(result)
+                results.append(result)
+        finally:
+            database.DB_PATH = previous
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"params": vars(args), "levels": results}, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,59 @@
 import sqlite3
+import heapq
+import math
 import os
-import pdfplumber
-
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+DB_PATH = "farming_data.db"
+
+# Once shards exist (farming_data.db -> farming_data_shards/<name>.db) farming_info lives there
+# and queries fan out across them; the answer cache always stays in DB_PATH.
+SHARD_WORKERS = 8
+SEARCH_TOP_K = 20
+# Each shard returns this many times k candidates, since re-scoring can reorder them
+SHARD_OVERFETCH = 4
+# bm25 settings: column weights for question and response, and FTS5's fixed k1 and b
+QUESTION_WEIGHT = 10.0
+RESPONSE_WEIGHT = 1.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_SHARD = "general"
+# Whole words only, with plurals spelled out ("tea" must not catch "teaching")
+SHARD_GROUPS = {
+    "cereals": ["maize", "corn", "wheat", "barley", "sorghum", "millet", "rice", "teff"],
+    "roots": ["potato", "potatoes", "cassava", "cassavas", "carrot", "carrots", "beetroot", "beetroots",
+              "yam", "yams"],
+    "vegetables": ["tomato", "tomatoes", "cabbage", "cabbages", "kale", "onion", "onions", "spinach",
+                   "bean", "beans", "pea", "peas"],
+    "fruits": ["mango", "mangoes", "mangos", "banana", "bananas", "avocado", "avocados", "strawberry",
+               "strawberries", "orange", "oranges"],
+    "cash_crops": ["coffee", "tea", "cotton", "sugarcane", "pyrethrum"],
+}
+
+# AI answers are reused for this long before the backend is asked again
+ANSWER_CACHE_TTL = 30 * 24 * 3600
+
+STOPWORDS = {"a", "an", "and", "are", "best", "can", "do", "does", "for", "how", "i", "in", "is", "it", "my",
+             "of", "on", "or", "should", "the", "to", "what", "when", "which", "with", "why", "you"}
 
 
 def test_pdf_data_retrieval(query):
     """Test retrieving data from PDFs stored in the database."""
-    conn = sqlite3.connect("farming_data.db")
-    cursor = conn.cursor()
+    results = []
+    for path in store_paths():
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
 
-    cursor.execute("SELECT question, response FROM farming_info WHERE question LIKE ?", ('%' + query + '%',))
-    results = cursor.fetchall()
+        cursor.execute("SELECT question, response FROM farming_info WHERE question LIKE ?", ('%' + query + '%',))
+        results += cursor.fetchall()
 
-    conn.close()
+        conn.close()
 
     if results:
         for question, response in results:
@@ -20,13 +61,14 @@ def test_pdf_data_retrieval(query):
     else:
         print("⚠️ No relevant information found. Try rephrasing your query.")
 
-# Test a query
-test_pdf_data_retrieval("wilt")
-
 # Initialize Database
-def init_db():
-    """Create the farming_info table if it doesn't exist."""
-    conn = sqlite3.connect("farming_data.db")
+def init_db(db_path=None):
+    """Create the farming_info table, its full-text index and the answer cache if they don't exist.
+
+    The database is switched to WAL mode, so cache writes and ingest don't block its readers.
+    """
+    conn = sqlite3.connect(db_path or DB_PATH)
+    conn.execute("PRAGMA journal_mode=WAL")
     cursor = conn.cursor()
 
     cursor.execute('''
@@ -37,16 +79,251 @@ def init_db():
         )
     ''')
 
+    # Full-text index over farming_info, kept in sync by triggers
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'farming_info_fts'")
+    index_exists = cursor.fetchone() is not None
+    cursor.executescript('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS farming_info_fts USING fts5(
+            question, response, content='farming_info', content_rowid='id', tokenize='porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS farming_info_ai AFTER INSERT ON farming_info BEGIN
+            INSERT INTO farming_info_fts(rowid, question, response) VALUES (new.id, new.question, new.response);
+        END;
+        CREATE TRIGGER IF NOT EXISTS farming_info_ad AFTER DELETE ON farming_info BEGIN
+            INSERT INTO farming_info_fts(farming_info_fts, rowid, question, response) VALUES ('delete', old.id, old.question, old.response);
+        END;
+        CREATE TRIGGER IF NOT EXISTS farming_info_au AFTER UPDATE ON farming_info BEGIN
+            INSERT INTO farming_info_fts(farming_info_fts, rowid, question, response) VALUES ('delete', old.id, old.question, old.response);
+            INSERT INTO farming_info_fts(rowid, question, response) VALUES (new.id, new.question, new.response);
+        END;
+
+        CREATE TABLE IF NOT EXISTS answer_cache (
+            question_key TEXT PRIMARY KEY,
+            answer TEXT,
+            created_at REAL
+        );
+    ''')
+    if not index_exists:
+        cursor.execute("INSERT INTO farming_info_fts(farming_info_fts) VALUES ('rebuild')")
+
     conn.commit()
     conn.close()
 
 
+def init_shard(path):
+    """Create a shard with the usual schema, making its directory if needed."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    init_db(path)
+
+
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+
+def ensure_schema(path=None):
+    """Run init_db once per process for a database about to be written (older databases lack the index)."""
+    path = path or DB_PATH
+    if path not in _schema_ready:
+        with _schema_lock:
+            if path not in _schema_ready:
+                if path == DB_PATH:
+                    init_db(path)
+                else:
+                    init_shard(path)
+                _schema_ready.add(path)
+
+
+_schema_checked = set()
+
+
+def check_schema(path=None):
+    """Readers only check for the index; building it is an ingest step, so reads never rewrite the file."""
+    path = path or DB_PATH
+    if path in _schema_ready or path in _schema_checked:
+        return
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    conn.close()
+    if not {"farming_info_fts", "answer_cache"} <= names:
+        raise RuntimeError(f"{path} has no full-text index yet; run `python database.py` to migrate it.")
+    _schema_checked.add(path)
+
+
+# Shards
+def shard_dir(db_path=None):
+    return os.path.splitext(db_path or DB_PATH)[0] + "_shards"
+
+
+def shard_path(name, db_path=None):
+    if not re.fullmatch(r"\w[\w-]*", name):
+        raise ValueError(f"Invalid shard name: {name!r}")
+    return os.path.join(shard_dir(db_path), f"{name}.db")
+
+
+def shard_for(question):
+    """Pick the crop-group shard for a question from the crops it mentions."""
+    words = set(re.findall(r"\w+", question.lower()))
+    for name, crops in SHARD_GROUPS.items():
+        if words.intersection(crops):
+            return name
+    return DEFAULT_SHARD
+
+
+def list_shards():
+    folder = shard_dir()
+    if not os.path.isdir(folder):
+        return []
+    return sorted(name[:-3] for name in os.listdir(folder) if name.endswith(".db"))
+
+
+def store_paths():
+    """Databases holding farming_info: every shard, or DB_PATH while the store isn't sharded."""
+    return [shard_path(name) for name in list_shards()] or [DB_PATH]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def fan_out(func, *args):
+    """Call func(path, *args) for every store database on a shared thread pool; results keep shard order."""
+    global _pool
+    paths = store_paths()
+    if len(paths) == 1:
+        return [func(paths[0], *args)]
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=SHARD_WORKERS, thread_name_prefix="shard")
+    return list(_pool.map(lambda path: func(path, *args), paths))
+
+
+def _all_rows(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT question, response FROM farming_info").fetchall()
+    conn.close()
+    return rows
+
+
+def _replace_contents(path, source):
+    """Copy the `source` database over `path` in one transaction; WAL readers keep their snapshot."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(path)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    _schema_ready.discard(path)
+    _schema_checked.discard(path)
+    ensure_schema(path)
+
+
+def rebuild_shard(name, rows=None, replace=False):
+    """Rebuild one shard, re-indexing and compacting it.
+
+    New (question, response) rows are merged into the current ones, replacing rows with the
+    same question; with replace=True they become the shard's only rows.
+    """
+    path = shard_path(name)
+    if rows is None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No shard named {name!r} in {shard_dir()}")
+        rows = _all_rows(path)
+    elif not replace and os.path.exists(path):
+        merged = dict(_all_rows(path))
+        merged.update(rows)
+        rows = list(merged.items())
+
+    # Build next to the shard (not as *.db, so queries don't see it) and swap the contents in
+    os.makedirs(shard_dir(), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=shard_dir())
+    os.close(fd)
+    try:
+        init_db(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        conn.executemany("INSERT OR IGNORE INTO farming_info (question, response) VALUES (?, ?)", rows)
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM farming_info").fetchone()[0]
+        conn.close()
+        _replace_contents(path, tmp_path)
+    finally:
+        os.remove(tmp_path)
+    return count
+
+
+def attach_shard(source, name=None):
+    """Copy the farming_info rows of another database in as a shard (replacing one with the same name)."""
+    name = name or os.path.splitext(os.path.basename(source))[0]
+    shard_path(name)  # validate the name before reading anything
+    if not os.path.isfile(source):
+        raise FileNotFoundError(f"No such database: {source}")
+
+    conn = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT question, response FROM farming_info").fetchall()
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"{source} has no usable farming_info table ({e})") from e
+    finally:
+        conn.close()
+
+    # Only farming_info comes across; the shard gets a fresh index and nothing else from the source
+    rebuild_shard(name, rows, replace=True)
+    return name
+
+
+def detach_shard(name):
+    path = shard_path(name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No shard named {name!r} in {shard_dir()}")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    _schema_ready.discard(path)
+    _schema_checked.discard(path)
+
+
+def split_into_shards():
+    """Route the rows of DB_PATH's farming_info into crop-group shards; returns rows per shard.
+
+    Rows already in a shard are kept (and win over DB_PATH's copy of the same question),
+    since ingest writes only to the shards once they exist.
+    """
+    rows = _all_rows(DB_PATH)
+
+    groups = {}
+    for question, response in rows:
+        groups.setdefault(shard_for(question), []).append((question, response))
+
+    existing = set(list_shards())
+    counts = {}
+    for name, group in sorted(groups.items()):
+        current = _all_rows(shard_path(name)) if name in existing else []
+        counts[name] = rebuild_shard(name, current + group, replace=True)
+    return counts
+
+
+def write_rows(rows):
+    """INSERT OR IGNORE (question, response) rows, one transaction per shard they route to."""
+    sharded = bool(list_shards())
+    groups = {}
+    for question, response in rows:
+        path = shard_path(shard_for(question)) if sharded else DB_PATH
+        groups.setdefault(path, []).append((question, response))
+
+    for path, group in groups.items():
+        ensure_schema(path)
+        conn = sqlite3.connect(path)
+        conn.executemany("INSERT OR IGNORE INTO farming_info (question, response) VALUES (?, ?)", group)
+        conn.commit()
+        conn.close()
+
+
 # Insert Predefined Farming Data
 def insert_farming_data():
     """Insert predefined farming questions and answers into the database."""
-    conn = sqlite3.connect("farming_data.db")
-    cursor = conn.cursor()
-
     farming_data = [
         # 🌽 Maize-related questions
         ("How can I grow maize?", "To grow maize, ensure well-drained soil, plant during the rainy season, and use quality seeds."),
@@ -67,18 +344,16 @@ def insert_farming_data():
         ("What soil is best for carrots?", "Well-drained, sandy loam soil with a pH between 6.0 and 6.8.")
     ]
 
-    for question, response in farming_data:
-        cursor.execute("INSERT OR IGNORE INTO farming_info (question, response) VALUES (?, ?)", (question, response))
-
-    conn.commit()
-    conn.close()
+    write_rows(farming_data)
 
 
 # Extract Text from PDFs
-def extract_text_from_pdfs():
+@metrics.timed("pdf_extract")
+def extract_text_from_pdfs(pdf_folder="kalro_pdfs"):
     """Extracts text from PDFs in the 'kalro_pdfs' folder."""
+    import pdfplumber
+
     data = {}
-    pdf_folder = "kalro_pdfs"
 
     if not os.path.exists(pdf_folder):
         print("⚠️ PDF folder does not exist!")
@@ -98,70 +373,250 @@ def extract_text_from_pdfs():
     return data
 
 
-# Store Extracted PDF Content in Database
-def store_in_db(data):
-    """Store extracted PDF data into the database with meaningful question-based entries."""
-    conn = sqlite3.connect("farming_data.db")
-    cursor = conn.cursor()
-
+def document_rows(data):
+    """Turn extracted {filename: text} documents into (question, response) rows."""
+    rows = []
     for filename, text in data.items():
         # Extract the first 10 words as the "question" if no clear question exists
         question = " ".join(text.split()[:10]) + "?"  # Convert first sentence to a question-like format
         response = text.strip()
 
         if question and response:
-            cursor.execute("INSERT OR IGNORE INTO farming_info (question, response) VALUES (?, ?)", (question, response))
-            print(f"✅ Stored: {question}")  # Debugging print
+            rows.append((question, response))
+    return rows
 
-    conn.commit()
-    conn.close()
 
+# Store Extracted PDF Content in Database
+@metrics.timed("db_store")
+def store_in_db(data):
+    """Store extracted PDF data into the database with meaningful question-based entries."""
+    rows = document_rows(data)
+    write_rows(rows)
+    for question, _ in rows:
+        print(f"✅ Stored: {question}")  # Debugging print
 
 
-def search_farming_info(query):
-    """Search the database for a query, handling multiple keywords and partial matches."""
-    conn = sqlite3.connect("farming_data.db")
+def _ranked_matches(path, match, k):
+    """Top-k (bm25, response) pairs from one database, best first."""
+    check_schema(path)
+    conn = sqlite3.connect(path)
     cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT bm25(farming_info_fts, {QUESTION_WEIGHT}, {RESPONSE_WEIGHT}), farming_info.response FROM farming_info_fts
+        JOIN farming_info ON farming_info.id = farming_info_fts.rowid
+        WHERE farming_info_fts MATCH ?
+        ORDER BY 1
+        LIMIT ?
+    ''', (match, k))
+    data = cursor.fetchall()
+    conn.close()
+    return data
 
-    # Split query into individual keywords for better matching
-    keywords = query.split()
-    conditions = " OR ".join(["question LIKE ? OR response LIKE ?" for _ in keywords])
-    params = sum([('%' + word + '%', '%' + word + '%') for word in keywords], ())
-
-    cursor.execute(f"""
-        SELECT response FROM farming_info
-        WHERE {conditions}
-    """, params)
 
-    results = cursor.fetchall()
+def _varints(blob):
+    """Decode the SQLite varints FTS5 uses in its averages and docsize records."""
+    values, value, length = [], 0, 0
+    for byte in blob:
+        if length == 8:
+            values.append((value << 8) | byte)
+            value, length = 0, 0
+            continue
+        value = (value << 7) | (byte & 0x7F)
+        length += 1
+        if not byte & 0x80:
+            values.append(value)
+            value, length = 0, 0
+    return values
+
+
+def _phrase_for(token, phrases):
+    """The query phrase a highlighted token matched: the one sharing the longest prefix with it."""
+    def shared(phrase):
+        word = phrase.strip('"*')
+        return len(os.path.commonprefix([word, token]))
+    return max(phrases, key=shared)
+
+
+def _shard_candidates(path, phrases, operator, k):
+    """A shard's local top-k plus the term statistics needed to score it store-wide.
+
+    Returns (rows, tokens, {phrase: matching rows}, [(response, row tokens, {phrase: weighted hits})]).
+    """
+    check_schema(path)
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    # highlight() marks every phrase hit, so one query yields the hit counts as well
+    cursor.execute(f'''
+        SELECT farming_info.id, farming_info.response,
+               highlight(farming_info_fts, 0, char(1), char(2)), highlight(farming_info_fts, 1, char(1), char(2))
+        FROM farming_info_fts
+        JOIN farming_info ON farming_info.id = farming_info_fts.rowid
+        WHERE farming_info_fts MATCH ?
+        ORDER BY bm25(farming_info_fts, {QUESTION_WEIGHT}, {RESPONSE_WEIGHT})
+        LIMIT ?
+    ''', (f" {operator} ".join(phrases), k))
+    candidates = cursor.fetchall()
+
+    # FTS5's own totals: row count, then tokens per column
+    averages = cursor.execute("SELECT block FROM farming_info_fts_data WHERE id = 1").fetchone()
+    rows, *column_tokens = _varints(averages[0]) if averages else [0]
+    hits = {
+        phrase: cursor.execute("SELECT COUNT(*) FROM farming_info_fts WHERE farming_info_fts MATCH ?",
+                               (phrase,)).fetchone()[0]
+        for phrase in phrases
+    }
+    ids = [candidate[0] for candidate in candidates]
+    cursor.execute(f"SELECT id, sz FROM farming_info_fts_docsize WHERE id IN ({', '.join('?' * len(ids))})", ids)
+    sizes = {rowid: sum(_varints(size)) for rowid, size in cursor.fetchall()}
     conn.close()
 
+    scored = []
+    for rowid, response, question_marked, response_marked in candidates:
+        freqs = {}
+        for weight, marked in ((QUESTION_WEIGHT, question_marked), (RESPONSE_WEIGHT, response_marked)):
+            for token in re.findall("\x01(.*?)\x02", marked, re.S):
+                phrase = _phrase_for(token.lower(), phrases)
+                freqs[phrase] = freqs.get(phrase, 0) + weight
+        scored.append((response, sizes.get(rowid, 0), freqs))
+    return rows, sum(column_tokens), hits, scored
+
+
+def _idf(rows, hits):
+    """FTS5's bm25 IDF, including its floor for phrases found in over half the rows."""
+    idf = math.log((rows - hits + 0.5) / (hits + 0.5))
+    return idf if idf > 0 else 1e-6
+
+
+def top_matches(phrases, operator, k):
+    """Fan an FTS query out to every shard and merge the best k as (bm25, response) pairs, best first."""
+    paths = store_paths()
+    if len(paths) == 1:
+        return _ranked_matches(paths[0], f" {operator} ".join(phrases), k)
+
+    # Crop-group shards skew term statistics on purpose ("maize" is in every cereals row, so its
+    # local IDF is ~0), so per-shard bm25 scores aren't comparable. Recompute FTS5's bm25 for
+    # each shard's candidates with row counts, phrase counts and average length summed over all
+    # shards. Candidates are still picked by local rank, hence the over-fetch.
+    shards = fan_out(_shard_candidates, phrases, operator, k * SHARD_OVERFETCH)
+    rows = sum(shard[0] for shard in shards)
+    avg_tokens = sum(shard[1] for shard in shards) / max(rows, 1)
+    idf = {phrase: _idf(rows, sum(shard[2][phrase] for shard in shards)) for phrase in phrases}
+
+    scored = []
+    for _, _, _, candidates in shards:
+        for response, tokens, freqs in candidates:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * tokens / avg_tokens)
+            score = sum(idf[phrase] * freq * (BM25_K1 + 1) / (freq + norm) for phrase, freq in freqs.items())
+            scored.append((-score, response))
+    return heapq.nsmallest(k, scored)
+
+
+@metrics.timed("db_search")
+def search_farming_info(query, k=SEARCH_TOP_K):
+    """Search the database for a query, handling multiple keywords and partial matches."""
+    # Any keyword may match, and each keyword also matches longer words ("wil" -> "wilt")
+    phrases = fts_phrases(query, prefix=True)
+    results = top_matches(phrases, "OR", k) if phrases else []
+
     if results:
-        responses = "\n\n".join([result[0][:500] + "..." for result in results])  # Limit long responses
+        responses = "\n\n".join([result[1][:500] + "..." for result in results])  # Limit long responses
         return f"💡 Found {len(results)} match(es):\n{responses}"
     else:
         return f"⚠️ No relevant farming info found for '{query}'. Try using general terms like 'wilt' or 'potato disease'."
 
-def get_farming_info(query):
-    """Search database first, fallback to AI if no match."""
-    conn = sqlite3.connect("farming_data.db")
-    cursor = conn.cursor()
+# Dashboard FAQ helpers (cached by app.py)
+@metrics.timed("faq_list_query")
+def load_faqs(limit=5):
+    faqs = []
+    for path in store_paths():
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT question, response FROM farming_info LIMIT ?", (limit - len(faqs),))
+        faqs += cursor.fetchall()
+        conn.close()
+        if len(faqs) >= limit:
+            break
+    return faqs
+
+
+def question_key(query):
+    """Normalise a question so trivially different phrasings share a cache entry."""
+    return " ".join(re.findall(r"\w+", query.lower()))
+
+
+def fts_phrases(query, prefix=False):
+    """One FTS5 phrase per meaningful word of the question."""
+    words = [w for w in re.findall(r"\w+", query.lower()) if w not in STOPWORDS]
+    star = "*" if prefix else ""
+    return [f'"{w}"{star}' for w in words]
+
+
+def fts_query(query, operator="AND", prefix=False):
+    """Build an FTS5 query from the meaningful words of the question (all of them required by default)."""
+    return f" {operator} ".join(fts_phrases(query, prefix))
+
+
+# Tier 1: indexed FAQ lookup
+@metrics.timed("faq_index_lookup")
+def lookup_faq(query):
+    phrases = fts_phrases(query)
+    if not phrases:
+        return None
+
+    data = top_matches(phrases, "AND", 1)
+    return data[0][1] if data else None
 
-    query = query.lower()
-    cursor.execute("SELECT response FROM farming_info WHERE question LIKE ?", ('%' + query + '%',))
+
+# Tier 2: persistent cache of AI answers
+def get_cached_answer(query):
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    cursor.execute("SELECT answer FROM answer_cache WHERE question_key = ? AND created_at > ?",
+                   (question_key(query), time.time() - ANSWER_CACHE_TTL))
     data = cursor.fetchone()
+    conn.close()
+    return data[0] if data else None
 
+
+def cache_answer(query, answer):
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("INSERT OR REPLACE INTO answer_cache (question_key, answer, created_at) VALUES (?, ?, ?)",
+                 (question_key(query), answer, time.time()))
+    conn.commit()
     conn.close()
 
-    if data:
-        return data[0]  # Return database answer if found
-    else:
-        return get_chatbot_response(query)  # Use AI if no match
 
+@metrics.timed("db_get_farming_info")
+def get_farming_info(query):
+    """Answer from the FAQ index, then the answer cache, then the AI backend."""
+    check_schema()
+
+    answer = lookup_faq(query)
+    if answer:
+        metrics.inc("answers_total", "faq")
+        return answer
+
+    answer = get_cached_answer(query)
+    if answer:
+        metrics.inc("answers_total", "cache")
+        return answer
+
+    # Tier 3: AI backend, bounded by timeouts, a concurrency limit and a circuit breaker
+    import chatbot
+
+    try:
+        answer = chatbot.generate_answer(query)
+    except chatbot.BackendError:
+        metrics.inc("answers_total", "unanswered")
+        return f"⚠️ No relevant farming info found for '{query}'. Try using general terms like 'wilt' or 'potato disease'."
 
-# Test Queries
-print(search_farming_info("wilt"))  # Should return PDF-stored data
-print(search_farming_info("maize")) # Should return manually inserted data
+    # A busy writer must not cost the user an answer the AI already gave
+    try:
+        cache_answer(query, answer)
+    except sqlite3.OperationalError:
+        metrics.inc("answer_cache_errors_total", "write")
+    metrics.inc("answers_total", "ai")
+    return answer
 
 
 # Initialize & Populate Database
@@ -174,6 +629,10 @@ if __name__ == "__main__":
     if extracted_data:
         store_in_db(extracted_data)
 
-    # Test a search query
+    # Test queries
+    test_pdf_data_retrieval("wilt")
+    print(search_farming_info("wilt"))  # Should return PDF-stored data
+    print(search_farming_info("maize")) # Should return manually inserted data
+
     user_query = "How can I grow maize?"
     print(f"\n🔍 Query: {user_query}\n💡 Answer: {search_farming_info(user_query)}")
@@ -0,0 +1,9 @@
+# Description: gunicorn settings for `gunicorn service:app` (read automatically from the working directory).
+
+
+def post_fork(server, worker):
+    # Load the models in each worker before it accepts requests, so concurrent
+    # first requests don't each load them (lru_cache doesn't lock).
+    import service
+
+    service.preload_models()
@@ -0,0 +1,98 @@
+import pickle
+from functools import lru_cache
+
+import metrics
+
+CROP_MODEL_PATH = "xgb_crop_model.pkl"
+CROP_ENCODER_PATH = "label_encoder.pkl"
+YIELD_MODEL_PATH = "random_forest_model.joblib"
+YIELD_ENCODER_PATH = "label_encoder.joblib"
+
+# Order of the soil & climate inputs the crop model was trained on
+CROP_FEATURES = ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"]
+
+
+# Load models once per process
+@lru_cache(maxsize=None)
+@metrics.timed("load_crop_model")
+def load_crop_model():
+    """Load the XGBoost crop model and its label encoder."""
+    with open(CROP_MODEL_PATH, "rb") as model_file:
+        model = pickle.load(model_file)
+
+    with open(CROP_ENCODER_PATH, "rb") as le_file:
+        le = pickle.load(le_file)
+
+    return model, le
+
+
+@lru_cache(maxsize=None)
+@metrics.timed("load_yield_model")
+def load_yield_model():
+    """Load the climate yield model and its region encoder."""
+    import joblib
+
+    model = joblib.load(YIELD_MODEL_PATH)
+    le = joblib.load(YIELD_ENCODER_PATH)
+    return model, le
+
+
+# Crop prediction logic
+@metrics.timed("predict_crop")
+def predict_crops(batch):
+    """Predict a crop for every feature row in one model call."""
+    import numpy as np
+
+    model, le = load_crop_model()
+    input_array = np.array(batch, dtype=float).reshape(len(batch), -1)
+    predicted_labels = model.predict(input_array)
+    metrics.inc("predictions_total", "predict_crop", len(batch))
+    return list(le.inverse_transform(predicted_labels))
+
+
+def predict_crop(input_features):
+    return predict_crops([input_features])[0]
+
+
+# Yield prediction logic
+def build_yield_features(region_encoded, temp, rain, events, co2, irrigation, fertilizer, soil_health):
+    """Build a feature row in the order the yield model expects."""
+    return [
+        temp,
+        rain,
+        events,
+        co2,
+        irrigation,
+        fertilizer,
+        soil_health,
+        region_encoded,
+        temp * rain,
+        events * temp,
+        temp ** 2,
+        rain ** 2
+    ]
+
+
+@metrics.timed("predict_yield")
+def predict_yields(batch):
+    """Predict yields for a batch of dicts keyed like the yield form inputs."""
+    import numpy as np
+
+    model, le = load_yield_model()
+    regions = le.transform([row["region"] for row in batch])
+    rows = [
+        build_yield_features(
+            region_encoded,
+            row["temperature"],
+            row["precipitation"],
+            row["extreme_events"],
+            row["co2"],
+            row["irrigation"],
+            row["fertilizer"],
+            row["soil_health"]
+        )
+        for region_encoded, row in zip(regions, batch)
+    ]
+    predictions = model.predict(np.array(rows, dtype=float))
+    metrics.inc("predictions_total", "predict_yield", len(batch))
+    return [float(p) for p in predictions]
@@ -2,6 +2,8 @@ import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
 
+import metrics
+
 # Category map for flexible classification
 CROP_CATEGORIES = {
     "maize": "grains",
@@ -14,6 +16,7 @@ CROP_CATEGORIES = {
     "mango": "fruits"
 }
 
+@metrics.timed("irrigation")
 def get_irrigation_recommendation(soil_input, temp_input, hum_input, crop_type="general"):
     crop_category = CROP_CATEGORIES.get(crop_type.lower(), "general")
 
@@ -0,0 +1,97 @@
+# Description: Load-test the HTTP API and report latency percentiles and throughput.
+# Start the service first: python service.py
+import argparse
+import json
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+FAQ_QUESTIONS = ["maize", "potato pests", "wilt", "best soil for carrots"]
+
+
+def crop_request(base_url):
+    body = {"features": [
+        random.randint(0, 140), random.randint(5, 145), random.randint(5, 205),
+        random.uniform(10, 40), random.uniform(15, 100), random.uniform(4, 9), random.uniform(20, 300)
+    ]}
+    return urllib.request.Request(f"{base_url}/predict/crop", data=json.dumps(body).encode(), method="POST")
+
+
+def irrigation_request(base_url):
+    body = {
+        "soil_moisture": random.randint(0, 100),
+        "temperature": random.randint(0, 50),
+        "humidity": random.randint(0, 100),
+        "crop": random.choice(["Maize", "Tomato", "Cassava", "Mango"])
+    }
+    return urllib.request.Request(f"{base_url}/irrigation", data=json.dumps(body).encode(), method="POST")
+
+
+def faq_request(base_url):
+    return urllib.request.Request(f"{base_url}/faq?q={quote(random.choice(FAQ_QUESTIONS))}")
+
+
+SCENARIOS = {
+    "crop": crop_request,
+    "irrigation": irrigation_request,
+    "faq": faq_request,
+}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def timed_call(make_request, base_url):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(make_request(base_url), timeout=30) as response:
+            response.read()
+        ok = True
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run_load_test(base_url, scenario, total, concurrency):
+    """Fire `total` requests with `concurrency` clients and summarise the results."""
+    make_request = SCENARIOS[scenario]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: timed_call(make_request, base_url), range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency * 1000 for latency, ok in results if ok)
+    return {
+        "scenario": scenario,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": sum(1 for _, ok in results if not ok),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "requests_per_sec": round(total / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the AgriAssistant HTTP API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=list(SCENARIOS) + ["all"], default="crop")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    for scenario in scenarios:
+        report = run_load_test(args.url, scenario, args.requests, args.concurrency)
+        print(f"📊 {report['scenario']}: p50={report['p50_ms']}ms p99={report['p99_ms']}ms "
+              f"{report['requests_per_sec']} req/s ({report['errors']} errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# Description: In-process latency histograms and counters with a Prometheus text dump.
+# Cheap enough to leave on: one perf_counter pair, a bisect and a short lock per call.
+import functools
+import threading
+import time
+from bisect import bisect_left
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PREFIX = "agri"
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        """Approximate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(BUCKETS, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+
+
+def observe(operation, seconds):
+    with _lock:
+        histogram = _histograms.get(operation)
+        if histogram is None:
+            histogram = _histograms[operation] = Histogram()
+        histogram.observe(seconds)
+
+
+def inc(name, operation, amount=1):
+    with _lock:
+        key = (name, operation)
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+class timer:
+    """Time a block as `operation`; exceptions also bump its error counter."""
+
+    __slots__ = ("operation", "start")
+
+    def __init__(self, operation):
+        self.operation = operation
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.operation, time.perf_counter() - self.start)
+        if exc_type is not None:
+            inc("errors_total", self.operation)
+        return False
+
+
+def timed(operation):
+    """Decorator form of `timer`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(operation):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """Summarise every operation for display, slowest total time first."""
+    with _lock:
+        rows = [
+            {
+                "operation": operation,
+                "count": h.count,
+                "errors": _counters.get(("errors_total", operation), 0),
+                "mean_ms": round(h.sum / h.count * 1000, 2) if h.count else 0.0,
+                "p50_ms": h.quantile(0.5) * 1000,
+                "p99_ms": h.quantile(0.99) * 1000,
+                "total_s": round(h.sum, 3),
+            }
+            for operation, h in _histograms.items()
+        ]
+    return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_prometheus():
+    """Render all metrics in the Prometheus text exposition format."""
+    with _lock:
+        histograms = {op: (list(h.counts), h.count, h.sum) for op, h in _histograms.items()}
+        counters = dict(_counters)
+
+    name = f"{PREFIX}_operation_seconds"
+    lines = [f"# HELP {name} Latency of instrumented operations.", f"# TYPE {name} histogram"]
+    for operation, (counts, count, total) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS + (float("inf"),), counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{operation="{operation}",le="{_format_bound(bound)}"}} {cumulative}')
+        lines.append(f'{name}_sum{{operation="{operation}"}} {total}')
+        lines.append(f'{name}_count{{operation="{operation}"}} {count}')
+
+    for counter in sorted({counter for counter, _ in counters}):
+        full_name = f"{PREFIX}_{counter}"
+        lines.append(f"# TYPE {full_name} counter")
+        for (c, operation), value in sorted(counters.items()):
+            if c == counter:
+                lines.append(f'{full_name}{{operation="{operation}"}} {value}')
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    with open(path, "w") as f:
+        f.write(render_prometheus())
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
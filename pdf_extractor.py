@@ -1,9 +1,12 @@
-import pdfplumber
 import os
 
-def extract_text_from_pdfs():
+import metrics
+
+@metrics.timed("pdf_extract")
+def extract_text_from_pdfs(pdf_folder="kalro_pdfs"):
+    import pdfplumber
+
     data = {}
-    pdf_folder = "kalro_pdfs"
 
     for pdf_file in os.listdir(pdf_folder):
         pdf_path = os.path.join(pdf_folder, pdf_file)
@@ -0,0 +1,166 @@
+# Description: Opt-in cProfile + tracemalloc capture for one Streamlit rerun or pipeline run.
+# Enable with AGRI_PROFILE=1 (every run in the process) or ?profile=1 (dashboard reruns, including
+# fragment reruns, while the query parameter is set).
+# Output lands in $AGRI_PROFILE_DIR (default: profiles/):
+#   <name>-<stamp>.pstats     load with pstats or snakeviz
+#   <name>-<stamp>.collapsed  feed to flamegraph.pl or speedscope
+#   <name>-<stamp>-alloc.txt  top allocations and peak traced memory
+import contextlib
+import functools
+import os
+import threading
+import time
+
+PROFILE_DIR = os.environ.get("AGRI_PROFILE_DIR", "profiles")
+TOP_ALLOCATIONS = 25
+
+# tracemalloc is process-wide, so concurrent profiles share it and the last one out stops it
+_tracing_users = 0
+_started_tracing = False
+_tracing_lock = threading.Lock()
+
+# Set while this thread is being profiled, so a profiled fragment inside a profiled rerun doesn't nest
+_active = threading.local()
+
+
+def enabled():
+    return os.environ.get("AGRI_PROFILE") == "1"
+
+
+def maybe_profile(name, force=False):
+    """Profile the block if profiling is switched on, otherwise do nothing."""
+    if (force or enabled()) and not getattr(_active, "running", False):
+        return profile(name)
+    return contextlib.nullcontext()
+
+
+def profiled(name, force=None):
+    """Decorator form of maybe_profile; `force` is an optional callable checked on every call.
+
+    Put it under @st.fragment so reruns of just that fragment are captured too.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with maybe_profile(name, force=force() if force else False):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def profile(name, output_dir=None):
+    import cProfile
+    import tracemalloc
+
+    output_dir = output_dir or PROFILE_DIR
+    _acquire_tracing()
+
+    profiler = cProfile.Profile()
+    _active.running = True
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _active.running = False
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            _release_tracing()
+
+        base = write_profile(profiler, snapshot, peak, name, output_dir)
+        print(f"🔬 Profile written to {base}.*")
+
+
+def _acquire_tracing():
+    global _tracing_users, _started_tracing
+    import tracemalloc
+
+    with _tracing_lock:
+        if _tracing_users == 0:
+            # Leave tracing alone if something else (e.g. python -X tracemalloc) turned it on
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+        _tracing_users += 1
+
+
+def _release_tracing():
+    global _tracing_users
+    import tracemalloc
+
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+
+
+def write_profile(profiler, snapshot, peak, name, output_dir):
+    import pstats
+
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{time.time_ns() % 1_000_000:06d}"
+    base = os.path.join(output_dir, f"{name}-{stamp}")
+
+    profiler.dump_stats(f"{base}.pstats")
+
+    stats = pstats.Stats(profiler)
+    with open(f"{base}.collapsed", "w") as f:
+        for stack, micros in collapsed_stacks(stats.stats):
+            f.write(f"{stack} {micros}\n")
+
+    with open(f"{base}-alloc.txt", "w") as f:
+        f.write(f"Peak traced memory: {peak / 1024 / 1024:.2f} MiB\n\n")
+        f.write(f"Top {TOP_ALLOCATIONS} allocation sites:\n")
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            f.write(f"{stat}\n")
+
+    return base
+
+
+def _frame_label(func):
+    filename, line, name = func
+    if filename == "~":
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ":").replace(" ", "_")
+
+
+def collapsed_stacks(raw_stats, max_depth=64):
+    """Turn cProfile's caller/callee graph into collapsed stacks (microseconds).
+
+    cProfile only records caller -> callee edges, so a function's time is split
+    across its callers in proportion to the time each edge accounts for.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in raw_stats.items():
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, edge_cumulative))
+
+    roots = [func for func, (_, _, _, _, callers) in raw_stats.items() if not callers]
+    totals = {}
+
+    def walk(func, path, seen, share):
+        _, _, own_time, _, _ = raw_stats[func]
+        stack = path + (_frame_label(func),)
+        micros = own_time * share * 1_000_000
+        if micros >= 1:
+            key = ";".join(stack)
+            totals[key] = totals.get(key, 0) + micros
+
+        if len(stack) >= max_depth:
+            return
+        for callee, edge_cumulative in callees.get(func, []):
+            callee_cumulative = raw_stats[callee][3]
+            # Skip recursion and paths too small to show up on a flamegraph
+            if callee in seen or share * edge_cumulative < 1e-6:
+                continue
+            walk(callee, stack, seen | {callee}, share * edge_cumulative / callee_cumulative)
+
+    for root in roots:
+        walk(root, (), frozenset([root]), 1.0)
+
+    return sorted((stack, int(micros)) for stack, micros in totals.items())
@@ -0,0 +1,127 @@
+# Description: Time the same button clicks end to end on the pre-fragment app (git c51b63b) and the current app.
+# Usage: python rerun_timing.py --runs 20 [--baseline c51b63b] [--app app.py]
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+
+from streamlit.runtime.scriptrunner import RerunData
+from streamlit.runtime.scriptrunner_utils.script_requests import ScriptRequests
+from streamlit.testing.v1 import AppTest, local_script_runner
+from streamlit.testing.v1.element_tree import parse_tree_from_messages
+
+BASELINE = "c51b63b"  # last commit before the tabs became fragments
+
+# (tab, button, text inputs filled before clicking); every answer is local, no AI calls
+INTERACTIONS = [
+    ("🌱 Crop Recommendation", "🚀 Predict Crop", {}),
+    ("💧 Irrigation", "💧 Recommend Irrigation", {}),
+    ("🤖 FAQ Chatbot", "🔍 Search Answer", {"Ask a farming question": "Best time to plant maize?"}),
+]
+
+
+@contextmanager
+def fragment_scoped(fragment_ids):
+    """Make AppTest reruns fragment-scoped, like the browser's rerun for a widget inside a fragment.
+
+    AppTest always asks for a full rerun; with no fragment ids this changes nothing.
+    """
+    real_run = local_script_runner.LocalScriptRunner.run
+
+    def run(runner, widget_state=None, query_params=None, timeout=3, page_hash=""):
+        # The runner queues a full rerun when it is built, which would swallow this one
+        runner._requests = ScriptRequests()
+        runner.request_rerun(RerunData(
+            widget_states=widget_state,
+            page_script_hash=page_hash,
+            fragment_id_queue=list(fragment_ids),
+            is_fragment_scoped_rerun=True,
+        ))
+        try:
+            if not runner._script_thread:
+                runner.start()
+            local_script_runner.require_widgets_deltas(runner, timeout)
+        finally:
+            runner.join()
+        return parse_tree_from_messages(runner.forward_msgs())
+
+    if fragment_ids:
+        local_script_runner.LocalScriptRunner.run = run
+    try:
+        yield
+    finally:
+        local_script_runner.LocalScriptRunner.run = real_run
+
+
+def find(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def measure(app_path, runs):
+    """Median milliseconds per click, and whether the clicks reran only a fragment."""
+    at = AppTest.from_file(os.path.abspath(app_path), default_timeout=120)
+    at.run()
+
+    results = {}
+    for tab, button, inputs in INTERACTIONS:
+        # The current app renders only the selected tab; the baseline renders all and ignores this
+        at.session_state["active_tab"] = tab
+        at.run()
+        for label, value in inputs.items():
+            find(at.text_input, label).input(value)
+
+        # The fragments registered by this run belong to the selected tab
+        fragment_ids = list(at._fragment_storage._fragments)
+        timings = []
+        with fragment_scoped(fragment_ids):
+            for _ in range(runs + 1):
+                find(at.button, button).click()
+                start = time.perf_counter()
+                at.run()
+                timings.append(time.perf_counter() - start)
+        # The first click warms caches and model loads
+        results[button] = (statistics.median(timings[1:]) * 1000, bool(fragment_ids))
+    return results
+
+
+def baseline_app(rev, app_path):
+    """Write `git show <rev>:app.py` next to the app so its imports and model paths resolve."""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:app.py"], capture_output=True, text=True, check=True
+    ).stdout
+    fd, path = tempfile.mkstemp(prefix="_baseline_", suffix=".py", dir=os.path.dirname(os.path.abspath(app_path)))
+    with os.fdopen(fd, "w") as f:
+        f.write(source)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end click timing, before and after tab fragments")
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--baseline", default=BASELINE, help="Git revision of the app to compare against")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    path = baseline_app(args.baseline, args.app)
+    try:
+        before = measure(path, args.runs)
+    finally:
+        os.remove(path)
+    after = measure(args.app, args.runs)
+
+    print(f"⏱️ Median end-to-end click time over {args.runs} runs")
+    print(f"   {'interaction':<24} {'before':>10} {'after':>10}")
+    for _, button, _ in INTERACTIONS:
+        (before_ms, _), (after_ms, scoped) = before[button], after[button]
+        rerun = "fragment rerun" if scoped else "full rerun"
+        print(f"   {button:<24} {before_ms:7.1f} ms {after_ms:7.1f} ms  ({rerun}, {before_ms / after_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
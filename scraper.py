@@ -1,10 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
 import os
 
 KALRO_URL = "https://www.kalro.org/information-resources/information-brochures/"
 
 def get_pdf_links():
+    import requests
+    from bs4 import BeautifulSoup
+
     headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
@@ -25,9 +26,10 @@ def get_pdf_links():
         return pdf_links
     else:
         return []
-print(response.text)
 
 def download_pdfs():
+    import requests
+
     pdf_links = get_pdf_links()
     if not pdf_links:
         print("⚠️ No PDFs found. Check if the website structure has changed.")
@@ -0,0 +1,284 @@
+# Description: Lightweight HTTP API for crop, irrigation, yield and FAQ lookups.
+# Runs under gunicorn (service:app, see gunicorn.conf.py) or locally with `python service.py`.
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import metrics
+from database import get_farming_info, search_farming_info
+from inference import CROP_FEATURES, load_crop_model, load_yield_model, predict_crops, predict_yields
+from irrigation import get_irrigation_recommendation
+
+YIELD_FIELDS = ["region", "temperature", "precipitation", "extreme_events", "co2", "irrigation", "fertilizer", "soil_health"]
+
+
+class MicroBatcher:
+    """Collect concurrent requests for a short window and run them as one batch call."""
+
+    def __init__(self, batch_fn, max_batch=64, window_ms=5):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, item, timeout=30):
+        """Queue one item and block until its batched result is ready."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future))
+        return future.result(timeout)
+
+    def _ensure_started(self):
+        # Started lazily so forked gunicorn workers each get their own thread
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.batch_fn([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+crop_batcher = MicroBatcher(predict_crops)
+yield_batcher = MicroBatcher(predict_yields)
+
+
+class BadRequest(Exception):
+    pass
+
+
+# Request parsing
+def finite(value):
+    """float(value), rejecting NaN and infinities, which json.loads accepts."""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"{value!r} is not a finite number")
+    return number
+
+
+def read_json(environ):
+    try:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = json.loads(environ["wsgi.input"].read(length) or b"{}")
+    except (ValueError, json.JSONDecodeError):
+        raise BadRequest("Request body must be valid JSON.")
+    if not isinstance(body, dict):
+        raise BadRequest("Request body must be a JSON object.")
+    return body
+
+
+def parse_crop_features(body):
+    """Accept either a `features` list or named soil & climate fields."""
+    features = body.get("features")
+    if features is None:
+        features = [body.get(name) for name in CROP_FEATURES]
+    elif not isinstance(features, list):
+        raise BadRequest("features must be a list of numbers.")
+
+    try:
+        features = [finite(value) for value in features]
+    except (TypeError, ValueError):
+        raise BadRequest(f"Crop features must be finite numbers: {', '.join(CROP_FEATURES)}.")
+
+    if len(features) != len(CROP_FEATURES):
+        raise BadRequest(f"Expected {len(CROP_FEATURES)} crop features, got {len(features)}.")
+    return features
+
+
+def parse_yield_inputs(body):
+    missing = [name for name in YIELD_FIELDS if name not in body]
+    if missing:
+        raise BadRequest(f"Missing yield fields: {', '.join(missing)}.")
+
+    _, le = load_yield_model()
+    if not isinstance(body["region"], str) or body["region"] not in le.classes_:
+        raise BadRequest(f"Unknown region: {body['region']}.")
+
+    try:
+        row = {name: finite(body[name]) for name in YIELD_FIELDS if name != "region"}
+    except (TypeError, ValueError):
+        raise BadRequest("Yield inputs other than region must be finite numbers.")
+    row["region"] = body["region"]
+    return row
+
+
+# Route handlers
+def handle_crop(environ):
+    features = parse_crop_features(read_json(environ))
+    return {"crop": str(crop_batcher.submit(features))}
+
+
+def handle_irrigation(environ):
+    body = read_json(environ)
+    try:
+        soil = finite(body["soil_moisture"])
+        temp = finite(body["temperature"])
+        hum = finite(body["humidity"])
+    except (KeyError, TypeError, ValueError):
+        raise BadRequest("soil_moisture, temperature and humidity must be finite numbers.")
+
+    crop = body.get("crop", "general")
+    if not isinstance(crop, str):
+        raise BadRequest("crop must be a string.")
+    return {"recommendation": get_irrigation_recommendation(soil, temp, hum, crop)}
+
+
+def handle_yield(environ):
+    row = parse_yield_inputs(read_json(environ))
+    return {"yield_tons_per_hectare": round(yield_batcher.submit(row), 2)}
+
+
+def handle_faq(environ):
+    query = parse_qs(environ.get("QUERY_STRING", "")).get("q", [""])[0].strip()
+    if not query:
+        raise BadRequest("Pass a question with ?q=...")
+    return {"answer": search_farming_info(query)}
+
+
+def handle_answer(environ):
+    query = parse_qs(environ.get("QUERY_STRING", "")).get("q", [""])[0].strip()
+    if not query:
+        raise BadRequest("Pass a question with ?q=...")
+    return {"answer": get_farming_info(query)}
+
+
+def handle_health(environ):
+    return {"status": "ok"}
+
+
+ROUTES = {
+    ("POST", "/predict/crop"): handle_crop,
+    ("POST", "/irrigation"): handle_irrigation,
+    ("POST", "/predict/yield"): handle_yield,
+    ("GET", "/faq"): handle_faq,
+    ("GET", "/answer"): handle_answer,
+    ("GET", "/health"): handle_health,
+}
+
+
+def app(environ, start_response):
+    """WSGI entry point."""
+    method, path = environ["REQUEST_METHOD"], environ.get("PATH_INFO", "")
+
+    if (method, path) == ("GET", "/metrics"):
+        body = metrics.render_prometheus().encode("utf-8")
+        start_response("200 OK", [("Content-Type", "text/plain; version=0.0.4"), ("Content-Length", str(len(body)))])
+        return [body]
+
+    handler = ROUTES.get((method, path))
+
+    if handler is None:
+        status, payload = "404 Not Found", {"error": "Unknown endpoint."}
+    else:
+        try:
+            with metrics.timer(f"http {method} {path}"):
+                status, payload = "200 OK", handler(environ)
+        except BadRequest as e:
+            status, payload = "400 Bad Request", {"error": str(e)}
+        except FileNotFoundError as e:
+            status, payload = "503 Service Unavailable", {"error": f"Model not available: {e.filename}"}
+        except Exception as e:
+            status, payload = "500 Internal Server Error", {"error": str(e)}
+
+    body = json.dumps(payload).encode("utf-8")
+    start_response(status, [("Content-Type", "application/json"), ("Content-Length", str(len(body)))])
+    return [body]
+
+
+# Local server with a fixed worker pool
+class PooledWSGIServer(WSGIServer):
+    workers = 8
+    request_queue_size = 256
+
+    def server_activate(self):
+        super().server_activate()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def preload_models():
+    """Load models up front so the first requests don't pay for it."""
+    load_crop_model()
+    try:
+        load_yield_model()
+    except FileNotFoundError as e:
+        print(f"⚠️ Yield model not found ({e.filename}); /predict/yield will return 503.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgriAssistant HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-window-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    for batcher in (crop_batcher, yield_batcher):
+        batcher.window = args.batch_window_ms / 1000
+        batcher.max_batch = args.max_batch
+
+    preload_models()
+
+    PooledWSGIServer.workers = args.workers
+    server = make_server(args.host, args.port, app, server_class=PooledWSGIServer, handler_class=QuietRequestHandler)
+    print(f"🚀 Serving AgriAssistant API on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Description: Manage the sharded knowledge store (farming_data.db -> farming_data_shards/<name>.db).
+# Usage: python shards.py list | split | rebuild <name> [--pdfs kalro_pdfs [--replace]] | attach <file.db> [--name NAME] | detach <name>
+import argparse
+import os
+import sqlite3
+import sys
+
+import database
+
+
+def show_shards():
+    names = database.list_shards()
+    if not names:
+        print(f"⚠️ No shards in {database.shard_dir()}; queries use {database.DB_PATH}")
+        return
+    for name in names:
+        path = database.shard_path(name)
+        conn = sqlite3.connect(path)
+        rows = conn.execute("SELECT COUNT(*) FROM farming_info").fetchone()[0]
+        conn.close()
+        print(f"  {name:<12} {rows:>8} rows {os.path.getsize(path) / 2 ** 20:>8.1f} MB")
+
+
+def run(args):
+    if args.command == "list":
+        show_shards()
+    elif args.command == "split":
+        for name, rows in database.split_into_shards().items():
+            print(f"✅ {name}: {rows} rows")
+    elif args.command == "rebuild":
+        rows = None
+        if args.pdfs:
+            documents = database.document_rows(database.extract_text_from_pdfs(args.pdfs))
+            rows = [row for row in documents if database.shard_for(row[0]) == args.name]
+        elif args.replace:
+            raise ValueError("--replace needs --pdfs to rebuild from")
+        print(f"✅ Rebuilt {args.name}: {database.rebuild_shard(args.name, rows, args.replace)} rows")
+    elif args.command == "attach":
+        print(f"✅ Attached {database.attach_shard(args.source, args.name)}")
+    elif args.command == "detach":
+        database.detach_shard(args.name)
+        print(f"🗑️ Detached {args.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage knowledge-store shards")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show shards and their row counts")
+    commands.add_parser("split", help=f"Route the rows of {database.DB_PATH} into crop-group shards")
+    rebuild = commands.add_parser("rebuild", help="Rebuild one shard (re-index in place, or merge in rows from PDFs)")
+    rebuild.add_argument("name")
+    rebuild.add_argument("--pdfs", help="Merge this shard's documents from a PDF folder into it")
+    rebuild.add_argument("--replace", action="store_true", help="With --pdfs, keep only the PDF rows")
+    attach = commands.add_parser("attach", help="Copy an existing farming_info database in as a shard")
+    attach.add_argument("source")
+    attach.add_argument("--name", help="Shard name (default: the file name)")
+    detach = commands.add_parser("detach", help="Remove a shard")
+    detach.add_argument("name")
+    args = parser.parse_args()
+
+    try:
+        run(args)
+    except (FileNotFoundError, ValueError, sqlite3.Error) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
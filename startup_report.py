@@ -0,0 +1,128 @@
+# Description: Import-time report and cold-start budget check for the entry points.
+# Usage: python startup_report.py [--check] [--json startup.json]
+import argparse
+import json
+import subprocess
+import sys
+
+# Cold-start budgets in milliseconds. Generous enough to absorb machine noise,
+# tight enough to catch a heavy import sneaking back to module level.
+BUDGETS_MS = {
+    "app (Home tab)": 1500,
+    "amain": 150,
+    "database": 100,
+    "inference": 100,
+    "chatbot": 100,
+}
+
+# Modules that opening the Home tab or importing amain must not pull in
+HEAVY_MODULES = ["xgboost", "sklearn", "skfuzzy", "joblib", "pdfplumber", "bs4", "PIL", "requests"]
+
+APP_COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def import_time(module):
+    """Run `python -X importtime` on one module.
+
+    Returns the module's cumulative import time, its slowest direct imports
+    and the names of every module it pulled in.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Nested imports are indented below the module that triggered them
+        entries.append((int(cumulative_us), name[1:]))
+
+    # Output is post-order: a module's imports are listed just above it
+    end = next((i for i, (_, name) in enumerate(entries) if name == module), None)
+    if end is None:
+        return 0.0, [], set()
+
+    start = end
+    while start > 0 and entries[start - 1][1].startswith(" "):
+        start -= 1
+    subtree = entries[start:end]
+
+    total = entries[end][0] / 1000
+    direct = sorted(((us, name.strip()) for us, name in subtree if name.startswith("  ") and not name.startswith("   ")), reverse=True)
+    imported = {name.strip().split(".")[0] for _, name in subtree}
+    return total, [(name, us / 1000) for us, name in direct[:5]], imported
+
+
+def app_cold_start():
+    """Time the first run of app.py (Home tab) in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", APP_COLD_START.format(heavy=HEAVY_MODULES)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"App cold start failed:\n{result.stderr[-2000:]}")
+
+    timing = json.loads(result.stdout.strip().splitlines()[-1])
+    return timing["ms"], timing["loaded"]
+
+
+def build_report():
+    report = {}
+
+    elapsed, loaded = app_cold_start()
+    report["app (Home tab)"] = {"ms": round(elapsed, 1), "heavy_modules": loaded}
+
+    for module in ["amain", "database", "inference", "chatbot"]:
+        total, slowest, imported = import_time(module)
+        loaded = [m for m in HEAVY_MODULES if m in imported]
+        report[module] = {"ms": round(total, 1), "slowest": slowest, "heavy_modules": loaded}
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time report for the AgriAssistant entry points")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if a budget is exceeded")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = build_report()
+    failures = []
+
+    for name, entry in report.items():
+        budget = BUDGETS_MS[name]
+        status = "✅" if entry["ms"] <= budget else "❌"
+        print(f"{status} {name:<16} {entry['ms']:8.1f} ms (budget {budget} ms)")
+        for module, ms in entry.get("slowest", []):
+            print(f"      {module:<24} {ms:8.1f} ms")
+
+        if entry["ms"] > budget:
+            failures.append(f"{name} took {entry['ms']} ms (budget {budget} ms)")
+        if entry["heavy_modules"]:
+            failures.append(f"{name} imported {', '.join(entry['heavy_modules'])} at startup")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if failures:
+        print("\n⚠️ " + "\n⚠️ ".join(failures))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# Description: Synthetic farming data for benchmarks and load tests.
+# Everything is seeded, so the same arguments always produce the same data.
+import os
+import random
+import shutil
+import sqlite3
+
+import database
+
+CROPS = ["maize", "wheat", "barley", "tomato", "potato", "cabbage", "strawberry", "mango", "banana",
+         "beans", "peas", "carrot", "cassava", "beetroot", "sorghum", "rice", "coffee", "tea"]
+TOPICS = ["grow", "plant", "fertilize", "irrigate", "harvest", "store", "control pests in", "prevent wilt in",
+          "choose seed for", "market"]
+REGIONS = ["Rift Valley", "Central", "Nyanza", "Western", "Eastern", "Coast", "Tigray", "Amhara", "Oromia"]
+VOCAB = ["soil", "rainfall", "seedlings", "compost", "manure", "spacing", "rows", "weeding", "mulch",
+         "drainage", "pH", "nitrogen", "phosphorus", "potassium", "fungicide", "rotation", "certified",
+         "season", "yield", "irrigation", "pests", "aphids", "blight", "wilt", "harvest", "storage", "market"]
+
+IRRIGATION_CROPS = ["Maize", "Wheat", "Tomato", "Potato", "Cassava", "Mango", "Banana", "Beans"]
+
+
+def farming_rows(n, seed=42):
+    """Generate `n` unique (question, response) pairs shaped like farming_info rows."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        crop, topic, region = rng.choice(CROPS), rng.choice(TOPICS), rng.choice(REGIONS)
+        question = f"How to {topic} {crop} in {region}? #{i}"
+        response = " ".join(rng.choice(VOCAB) for _ in range(rng.randint(20, 80)))
+        rows.append((question, f"For {crop}: {response}."))
+    return rows
+
+
+def build_farming_db(path, n, seed=42):
+    """Create a farming_info database at `path` holding `n` synthetic rows."""
+    if os.path.exists(path):
+        os.remove(path)
+    database.init_db(path)
+
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT OR IGNORE INTO farming_info (question, response) VALUES (?, ?)", farming_rows(n, seed))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def build_sharded_store(db_path, n, shards, seed=42):
+    """Spread `n` synthetic rows round-robin over `shards` shards next to `db_path`."""
+    folder = database.shard_dir(db_path)
+    if os.path.isdir(folder):
+        shutil.rmtree(folder)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    database.init_db(db_path)  # the main database still holds the answer cache
+
+    rows = farming_rows(n, seed)
+    for i in range(shards):
+        path = database.shard_path(f"part-{i}", db_path)
+        database.init_shard(path)
+        conn = sqlite3.connect(path)
+        conn.executemany("INSERT OR IGNORE INTO farming_info (question, response) VALUES (?, ?)", rows[i::shards])
+        conn.commit()
+        conn.close()
+    return folder
+
+
+def sensor_readings(n, seed=42):
+    """Field sensor readings as (soil_moisture, temperature, humidity, crop)."""
+    rng = random.Random(seed)
+    return [
+        (rng.randint(0, 100), rng.randint(0, 50), rng.randint(0, 100), rng.choice(IRRIGATION_CROPS))
+        for _ in range(n)
+    ]
+
+
+def soil_samples(n, seed=42):
+    """Soil & climate rows in crop-model order: N, P, K, temperature, humidity, pH, rainfall."""
+    rng = random.Random(seed)
+    return [
+        [rng.randint(0, 140), rng.randint(5, 145), rng.randint(5, 205), round(rng.uniform(8, 44), 2),
+         round(rng.uniform(14, 100), 2), round(rng.uniform(3.5, 9.9), 2), round(rng.uniform(20, 300), 2)]
+        for _ in range(n)
+    ]
+
+
+def brochure_texts(n, paragraphs=20, seed=42):
+    """Brochure-like documents keyed by file name, as the PDF extractors return them."""
+    rng = random.Random(seed)
+    docs = {}
+    for i in range(n):
+        crop = rng.choice(CROPS)
+        lines = [f"{crop.title()} production guide {i}"]
+        for _ in range(paragraphs):
+            lines.append(" ".join(rng.choice(VOCAB) for _ in range(12)))
+        docs[f"{crop}-guide-{i}"] = "\n".join(lines)
+    return docs
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path, lines, lines_per_page=45):
+    """Write a plain Helvetica text PDF, enough for pdfplumber to extract from."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(" ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+    ]
+    for i, page_lines in enumerate(pages):
+        text = " T* ".join(f"({_pdf_escape(line)}) Tj" for line in page_lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 770 Td {text} ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+                       f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>")
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def build_pdf_folder(folder, n, paragraphs=60, seed=42):
+    """Fill `folder` with `n` synthetic brochure PDFs."""
+    os.makedirs(folder, exist_ok=True)
+    for name, text in brochure_texts(n, paragraphs, seed).items():
+        write_text_pdf(os.path.join(folder, f"{name}.pdf"), text.splitlines())
+    return folder